@@ -1,11 +1,19 @@
-import time
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
-import math
+
+from formulas import (
+    calculate_initial_liquidity,
+    calculate_price_from_reserves,
+    calculate_buy_amount_out,
+    calculate_buy_to_reach_token_reserve,
+    calculate_sell_amount_out,
+    calculate_graduation_token_threshold,
+    generate_parameter_sweep,
+    simulate_trades,
+)
 
 st.set_page_config(
     page_title="Constant Product Bonding Curve Explorer",
@@ -15,128 +23,167 @@ st.set_page_config(
 )
 
 # Constants from Bonding.sol
-K_CONSTANT = 3_000_000_000_000
 DEFAULT_ASSET_RATE = 1000
 DEFAULT_INITIAL_SUPPLY = 1_000_000_000  # 1B tokens
 DEFAULT_GRAD_THRESHOLD_VIRTUALS = 42000  # Virtuals needed to graduate
+MAX_AUTO_TRADES = 500  # Safety limit on trade attempts for one auto-trading run
+MAX_PATH_POINTS = 600  # Trade path points kept for the live chart
 
-def calculate_initial_liquidity(token_supply, asset_rate, k_constant=K_CONSTANT):
+@st.cache_data(max_entries=32)
+def generate_hyperbola_data(x_min, x_max, k, num_points=200):
     """
-    Calculate initial Virtuals liquidity based on Bonding.sol formula:
-    k = ((K * 10000) / assetRate)
-    liquidity = (((k * 10000) / supply)) / 10000
-    """
-    k = (k_constant * 10000) / asset_rate
-    liquidity = (k * 10000) / token_supply / 10000
-    return liquidity
-
-def calculate_price_from_reserves(token_reserve, virtuals_reserve):
-    """Calculate price as Virtuals per token from reserves"""
-    if token_reserve == 0:
-        return 0
-    return virtuals_reserve / token_reserve
-
-def calculate_buy_amount_out(amount_virtuals_in, token_reserve, virtuals_reserve):
-    """
-    Calculate tokens received for Virtuals input using constant product formula
-    amount_out = (amount_in * reserve_out) / (reserve_in + amount_in)
+    Generate hyperbola data for constant product curve visualization
+    x * y = k where x = token_reserve, y = virtuals_reserve
+    x values are returned in millions of tokens, ready for plotting.
     """
-    if amount_virtuals_in <= 0:
-        return 0
+    x_values = np.linspace(x_min, x_max, num_points)
     
-    # Add 0.3% fee (like Uniswap)
-    amount_virtuals_in_after_fee = amount_virtuals_in * 0.997
+    # Calculate corresponding y values using x * y = k
+    y_values = k * np.reciprocal(x_values)
     
-    amount_token_out = (amount_virtuals_in_after_fee * token_reserve) / (virtuals_reserve + amount_virtuals_in_after_fee)
-    return amount_token_out
+    return x_values / 1_000_000, y_values
 
-def calculate_sell_amount_out(amount_token_in, token_reserve, virtuals_reserve):
+def build_base_hyperbola_fig(token_supply, virtuals_liquidity, k, x_min, x_max, asset_rate, grad_x_m, grad_virtuals, num_points=200):
     """
-    Calculate Virtuals received for token input using constant product formula
+    Build the hyperbola figure from the cached curve data, with the initial
+    state and graduation point marked.
     """
-    if amount_token_in <= 0:
-        return 0
+    x_values_m, y_values = generate_hyperbola_data(x_min, x_max, k, num_points)
     
-    # Add 0.3% fee
-    amount_token_in_after_fee = amount_token_in * 0.997
+    # The hyperbola curve, x is already in millions for readability
+    fig = px.line(
+        x=x_values_m,
+        y=y_values,
+        labels={'x': "Token Reserves (Millions)", 'y': "Virtuals Reserves"},
+        title=f"Constant Product Curve (Asset Rate: {asset_rate})",
+        height=500,
+        render_mode='webgl'
+    )
+    fig.update_traces(
+        name=f'x × y = {k:.2e}',
+        showlegend=True,
+        line=dict(color='#1f77b4', width=3),
+        hovertemplate=None,
+        hoverinfo='skip'
+    )
     
-    amount_virtuals_out = (amount_token_in_after_fee * virtuals_reserve) / (token_reserve + amount_token_in_after_fee)
-    return amount_virtuals_out
-
-def calculate_graduation_token_threshold(initial_token_supply, graduation_virtuals_needed, initial_virtuals_liquidity):
-    """
-    Calculate how many tokens need to be sold to raise the graduation threshold in Virtuals.
-    This is when token_reserve drops to a level where we've raised enough Virtuals.
-    """
-    # We need to find the token reserve level where:
-    # virtuals_reserve = initial_virtuals_liquidity + graduation_virtuals_needed
-    target_virtuals_reserve = initial_virtuals_liquidity + graduation_virtuals_needed
+    # Mark the initial point
+    fig.add_trace(go.Scatter(
+        x=[token_supply / 1_000_000],
+        y=[virtuals_liquidity],
+        mode='markers',
+        name='Initial State',
+        marker=dict(color='red', size=12, symbol='circle'),
+        hoverinfo='skip'
+    ))
+    
+    # Mark the graduation point
+    fig.add_trace(go.Scatter(
+        x=[grad_x_m],
+        y=[grad_virtuals],
+        mode='markers',
+        name='Graduation Point',
+        marker=dict(color='green', size=12, symbol='star'),
+        hoverinfo='skip'
+    ))
     
-    # Using constant product: token_reserve * virtuals_reserve = k
-    k = initial_token_supply * initial_virtuals_liquidity
-    target_token_reserve = k / target_virtuals_reserve
+    fig.update_layout(showlegend=True)
     
-    return target_token_reserve
-
-def generate_price_curve_data(initial_token_supply, initial_virtuals_liquidity, graduation_token_threshold):
-    """Generate price curve data by simulating purchases"""
-    # Start with initial reserves
-    token_reserve = initial_token_supply
-    virtuals_reserve = initial_virtuals_liquidity
+    # Add grid for better readability
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
     
-    # Calculate how many tokens we can sell before graduation
-    max_tokens_to_sell = initial_token_supply - graduation_token_threshold
+    return fig
+
+def build_live_fig(token_supply, virtuals_liquidity, k, graduation_token_threshold, x_min, x_max, num_points=200):
+    """
+    Build a fresh live position figure with the traces that only depend on the curve.
+    The curve arrays come from the cached generate_hyperbola_data; callers add
+    the session's trading path and current position on top.
+    """
+    x_values_m, y_values = generate_hyperbola_data(x_min, x_max, k, num_points)
     
-    # Simulate different amounts of tokens sold
-    tokens_sold_amounts = np.linspace(0, max_tokens_to_sell * 0.99, 100)
+    fig = go.Figure(data=[
+        # The hyperbola curve
+        go.Scattergl(
+            x=x_values_m,
+            y=y_values,
+            mode='lines',
+            name=f'Bonding Curve (k = {k:.2e})',
+            line=dict(color='lightblue', width=2, dash='dot')
+        ),
+        # Mark the initial point
+        go.Scatter(
+            x=[token_supply / 1_000_000],
+            y=[virtuals_liquidity],
+            mode='markers',
+            name='Initial State',
+            marker=dict(color='gray', size=12, symbol='circle')
+        ),
+        # Mark the graduation point
+        go.Scatter(
+            x=[graduation_token_threshold / 1_000_000],
+            y=[k / graduation_token_threshold],
+            mode='markers',
+            name='Graduation Point',
+            marker=dict(color='green', size=15, symbol='star')
+        )
+    ])
     
-    prices = []
-    market_caps = []
-    virtuals_reserves = []
-    token_reserves = []
-    virtuals_raised = []
+    fig.update_layout(
+        title="Real-time Position on Bonding Curve",
+        xaxis_title="Token Reserves (Millions)",
+        yaxis_title="Virtuals Reserves",
+        height=500,
+        showlegend=True
+    )
     
-    for tokens_sold in tokens_sold_amounts:
-        # Calculate current reserves after selling this many tokens
-        current_token_reserve = initial_token_supply - tokens_sold
-        
-        # Using constant product to find current virtuals reserve
-        k = initial_token_supply * initial_virtuals_liquidity
-        current_virtuals_reserve = k / current_token_reserve
-        
-        # Calculate current price
-        price = calculate_price_from_reserves(current_token_reserve, current_virtuals_reserve)
-        
-        # Market cap is circulating supply * price
-        circulating_supply = tokens_sold
-        market_cap = circulating_supply * price
-        
-        # Virtuals raised is the difference from initial
-        virtuals_raised_amount = current_virtuals_reserve - initial_virtuals_liquidity
-        
-        prices.append(price)
-        market_caps.append(market_cap)
-        virtuals_reserves.append(current_virtuals_reserve)
-        token_reserves.append(current_token_reserve)
-        virtuals_raised.append(virtuals_raised_amount)
+    # Add grid and improve styling
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', zeroline=True)
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', zeroline=True)
     
-    return tokens_sold_amounts, np.array(prices), np.array(market_caps), np.array(virtuals_reserves), np.array(token_reserves), np.array(virtuals_raised)
+    return fig
+
+def empty_transaction_history():
+    """Trade log stored column-wise, one list per field"""
+    return {'is_buy': [], 'amount_in': [], 'amount_out': [], 'price': []}
 
-def generate_hyperbola_data(token_supply, virtuals_liquidity, num_points=200):
+def record_trades(is_buy, amounts_in, amounts_out, prices):
     """
-    Generate hyperbola data for constant product curve visualization
-    x * y = k where x = token_reserve, y = virtuals_reserve
+    Append trades to the column-wise transaction history.
+    amount_in/amount_out are Virtuals/tokens for buys and tokens/Virtuals for sells.
     """
-    k = token_supply * virtuals_liquidity
-    
-    x_min = token_supply * 0.05 * 5000/asset_rate
-    x_max = token_supply * 1.5
-    x_values = np.linspace(x_min, x_max, num_points)
+    history = st.session_state.transaction_history
+    history['is_buy'].extend(np.atleast_1d(is_buy).tolist())
+    history['amount_in'].extend(np.atleast_1d(amounts_in).tolist())
+    history['amount_out'].extend(np.atleast_1d(amounts_out).tolist())
+    history['price'].extend(np.atleast_1d(prices).tolist())
+
+def record_trade_path(token_reserves_m, virtuals_reserves):
+    """
+    Write post-trade reserves into the live chart's ring buffer.
+    Once the buffer is full the oldest points are overwritten.
+    """
+    token_reserves_m = np.atleast_1d(token_reserves_m)
+    virtuals_reserves = np.atleast_1d(virtuals_reserves)
+    num_points = len(token_reserves_m)
     
-    # Calculate corresponding y values using x * y = k
-    y_values = k / x_values
+    # Only the newest MAX_PATH_POINTS of this batch can survive the wrap
+    keep = min(num_points, MAX_PATH_POINTS)
+    slots = (st.session_state.history_len + np.arange(num_points - keep, num_points)) % MAX_PATH_POINTS
+    st.session_state.history_x[slots] = token_reserves_m[-keep:]
+    st.session_state.history_y[slots] = virtuals_reserves[-keep:]
+    st.session_state.history_len += num_points
+
+def get_trade_path():
+    """Return the buffered trade path in trade order, oldest point first"""
+    history_len = st.session_state.history_len
+    if history_len <= MAX_PATH_POINTS:
+        return st.session_state.history_x[:history_len], st.session_state.history_y[:history_len]
     
-    return x_values, y_values, k
+    # Buffer has wrapped, the oldest point sits at the next write slot
+    shift = -(history_len % MAX_PATH_POINTS)
+    return np.roll(st.session_state.history_x, shift), np.roll(st.session_state.history_y, shift)
 
 # Main App
 st.title("🔗 Constant Product Bonding Curve Explorer")
@@ -178,6 +225,16 @@ grad_threshold_virtuals = st.sidebar.number_input(
     help="Amount of Virtuals that need to be raised for graduation to Uniswap"
 )
 
+# Number of points used to draw the hyperbola
+num_points = st.sidebar.slider(
+    "Hyperbola Resolution",
+    min_value=50,
+    max_value=500,
+    value=200,
+    step=25,
+    help="Fewer points render faster; more points give a smoother curve"
+)
+
 # Calculate initial liquidity using contract formula
 initial_virtuals_liquidity = calculate_initial_liquidity(initial_supply, asset_rate)
 
@@ -186,6 +243,18 @@ graduation_token_threshold = calculate_graduation_token_threshold(
     initial_supply, grad_threshold_virtuals, initial_virtuals_liquidity
 )
 
+# Constant product k, shared by the curve and graduation calculations
+k_value = initial_supply * initial_virtuals_liquidity
+
+# Plot coordinates of the initial and graduation points, reused by every chart
+grad_virtuals = k_value / graduation_token_threshold
+initial_x_m = initial_supply / 1_000_000
+grad_x_m = graduation_token_threshold / 1_000_000
+
+# Token reserve range used to draw the hyperbola
+hyperbola_x_min = initial_supply * 0.05 * 5000 / asset_rate
+hyperbola_x_max = initial_supply * 1.5
+
 # Display converted values
 initial_price = calculate_price_from_reserves(initial_supply, initial_virtuals_liquidity)
 
@@ -200,79 +269,39 @@ The curve shifts based on the asset rate parameter.
 hyperbola_col1, hyperbola_col2 = st.columns([3, 1])
 
 with hyperbola_col1:
-    # Generate hyperbola data
-    x_values, y_values, k_value = generate_hyperbola_data(initial_supply, initial_virtuals_liquidity)
-    
-    # Create the hyperbola plot
-    fig_hyperbola = go.Figure()
-    
-    # Add the hyperbola curve
-    fig_hyperbola.add_trace(
-        go.Scatter(
-            x=x_values / 1_000_000,  # Convert to millions for readability
-            y=y_values,
-            mode='lines',
-            name=f'x × y = {k_value:.2e}',
-            line=dict(color='#1f77b4', width=3)
-        )
-    )
-    
-    # Mark the initial point
-    fig_hyperbola.add_trace(
-        go.Scatter(
-            x=[initial_supply / 1_000_000],
-            y=[initial_virtuals_liquidity],
-            mode='markers',
-            name='Initial State',
-            marker=dict(color='red', size=12, symbol='circle')
-        )
-    )
-    
-    # Mark the graduation point
-    fig_hyperbola.add_trace(
-        go.Scatter(
-            x=[graduation_token_threshold / 1_000_000],
-            y=[k_value / graduation_token_threshold],
-            mode='markers',
-            name='Graduation Point',
-            marker=dict(color='green', size=12, symbol='star')
-        )
+    # Build the curve figure with this run's graduation point
+    fig_hyperbola = build_base_hyperbola_fig(
+        initial_supply, initial_virtuals_liquidity, k_value,
+        hyperbola_x_min, hyperbola_x_max, asset_rate,
+        grad_x_m, grad_virtuals, num_points
     )
     
     # Add annotation for the graduation region
-    grad_virtuals_at_graduation = k_value / graduation_token_threshold
-    fig_hyperbola.add_annotation(
-        x=graduation_token_threshold / 1_000_000,
-        y=grad_virtuals_at_graduation,
-        text=f"Graduation<br>({graduation_token_threshold/1_000_000:.0f}M tokens, {grad_virtuals_at_graduation:.0f} virtuals)",
-        showarrow=False,
-        arrowhead=2,
-        arrowcolor="green",
-        arrowwidth=2,
-        xshift=70,
-        yshift=20
-    )
+    fig_hyperbola.update_layout(annotations=[
+        dict(
+            x=grad_x_m,
+            y=grad_virtuals,
+            text=f"Graduation<br>({grad_x_m:.0f}M tokens, {grad_virtuals:.0f} virtuals)",
+            showarrow=False,
+            arrowhead=2,
+            arrowcolor="green",
+            arrowwidth=2,
+            xshift=70,
+            yshift=20
+        )
+    ])
     
-    fig_hyperbola.update_layout(
-        title=f"Constant Product Curve (Asset Rate: {asset_rate})",
-        xaxis_title="Token Reserves (Millions)",
-        yaxis_title="Virtuals Reserves",
-        height=500,
-        showlegend=True,
-        hovermode='closest'
+    # Static illustration, hover and zoom are kept for the live chart below
+    st.plotly_chart(
+        fig_hyperbola, theme=None, use_container_width=True,
+        config={'staticPlot': True, 'displayModeBar': False}
     )
-    
-    # Add grid for better readability
-    fig_hyperbola.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    fig_hyperbola.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    
-    st.plotly_chart(fig_hyperbola, use_container_width=True)
 
 with hyperbola_col2:
     st.subheader("🔢 Hyperbola Metrics")
     st.metric("Constant Product (k)", f"{k_value:.2e}")
-    st.metric("Initial Point", f"({initial_supply/1_000_000:.0f}M, {initial_virtuals_liquidity:.0f})")
-    st.metric("Graduation Point", f"({graduation_token_threshold/1_000_000:.0f}M, {grad_virtuals_at_graduation:.0f})")
+    st.metric("Initial Point", f"({initial_x_m:.0f}M, {initial_virtuals_liquidity:.0f})")
+    st.metric("Graduation Point", f"({grad_x_m:.0f}M, {grad_virtuals:.0f})")
 
 # Trading Simulator Section
 st.subheader("🔄 Interactive Trading Simulator")
@@ -284,202 +313,17 @@ if 'current_token_reserve' not in st.session_state:
 if 'current_virtuals_reserve' not in st.session_state:
     st.session_state.current_virtuals_reserve = initial_virtuals_liquidity
 if 'transaction_history' not in st.session_state:
-    st.session_state.transaction_history = []
+    st.session_state.transaction_history = empty_transaction_history()
+if 'history_x' not in st.session_state:
+    st.session_state.history_x = np.zeros(MAX_PATH_POINTS)  # Token reserve (millions) after each trade
+if 'history_y' not in st.session_state:
+    st.session_state.history_y = np.zeros(MAX_PATH_POINTS)  # Virtuals reserve after each trade
+if 'history_len' not in st.session_state:
+    st.session_state.history_len = 0  # Trades written to the ring buffer so far
 if 'total_tokens_sold' not in st.session_state:
     st.session_state.total_tokens_sold = 0
-if 'auto_trading' not in st.session_state:
-    st.session_state.auto_trading = False
-if 'auto_trade_count' not in st.session_state:
-    st.session_state.auto_trade_count = 0
-
-# Auto-trading logic (executes one trade per rerun)
-if st.session_state.auto_trading:
-    max_trades = 500  # Safety limit
-    
-    # Check if we should stop auto-trading
-    if (st.session_state.current_token_reserve <= graduation_token_threshold or 
-        st.session_state.auto_trade_count >= max_trades):
-        
-        st.session_state.auto_trading = False
-        if st.session_state.current_token_reserve <= graduation_token_threshold:
-            st.success(f"🎓 Auto-trading completed! Graduated after {st.session_state.auto_trade_count} trades!")
-        else:
-            st.warning(f"⚠️ Auto-trading stopped after {max_trades} trades (safety limit)")
-    else:
-        # Execute one trade
-        # 75% chance of buying, 25% chance of selling (bias towards graduation)
-        is_buy = np.random.random() < 0.60
-        
-        trade_executed = False
-        
-        if is_buy:
-            # Generate random buy amount using normal distribution
-            mean_virtuals = 1000
-            std_virtuals = 300
-            min_virtuals = 500
-            max_virtuals = min(st.session_state.current_virtuals_reserve * 0.2, 20000)
-            
-            virtuals_to_spend = max(min_virtuals, 
-                                  min(max_virtuals, 
-                                      np.random.normal(mean_virtuals, std_virtuals)))
-            
-            # Execute buy trade
-            tokens_received = calculate_buy_amount_out(
-                virtuals_to_spend, 
-                st.session_state.current_token_reserve, 
-                st.session_state.current_virtuals_reserve
-            )
-            
-            if tokens_received > 0:
-                new_virtuals_reserve = st.session_state.current_virtuals_reserve + virtuals_to_spend
-                new_token_reserve = st.session_state.current_token_reserve - tokens_received
-                new_price = calculate_price_from_reserves(new_token_reserve, new_virtuals_reserve)
-                
-                # Update state
-                st.session_state.current_virtuals_reserve = new_virtuals_reserve
-                st.session_state.current_token_reserve = new_token_reserve
-                st.session_state.total_tokens_sold += tokens_received
-                
-                # Add to history
-                st.session_state.transaction_history.append({
-                    'type': 'buy',
-                    'virtuals_in': virtuals_to_spend,
-                    'tokens_out': tokens_received,
-                    'price': new_price,
-                    'timestamp': len(st.session_state.transaction_history) + 1
-                })
-                
-                trade_executed = True
-                st.success(f"🤖 Auto-Buy #{st.session_state.auto_trade_count + 1}: {tokens_received:,.0f} tokens for {virtuals_to_spend:,.0f} Virtuals")
-        
-        else:
-            # Only sell if we have tokens to sell
-            if st.session_state.total_tokens_sold > 1000:
-                # Generate random sell amount
-                max_sellable = st.session_state.total_tokens_sold * 0.3
-                mean_tokens = min(1000000, max_sellable * 0.5)
-                std_tokens = mean_tokens * 0.4
-                min_tokens = 500
-                
-                tokens_to_sell = max(min_tokens, 
-                                   min(max_sellable, 
-                                       np.random.normal(mean_tokens, std_tokens)))
-                
-                # Execute sell trade
-                virtuals_received = calculate_sell_amount_out(
-                    tokens_to_sell, 
-                    st.session_state.current_token_reserve, 
-                    st.session_state.current_virtuals_reserve
-                )
-                
-                if virtuals_received > 0:
-                    new_virtuals_reserve = st.session_state.current_virtuals_reserve - virtuals_received
-                    new_token_reserve = st.session_state.current_token_reserve + tokens_to_sell
-                    new_price = calculate_price_from_reserves(new_token_reserve, new_virtuals_reserve)
-                    
-                    # Update state
-                    st.session_state.current_virtuals_reserve = new_virtuals_reserve
-                    st.session_state.current_token_reserve = new_token_reserve
-                    st.session_state.total_tokens_sold = max(0, st.session_state.total_tokens_sold - tokens_to_sell)
-                    
-                    # Add to history
-                    st.session_state.transaction_history.append({
-                        'type': 'sell',
-                        'tokens_in': tokens_to_sell,
-                        'virtuals_out': virtuals_received,
-                        'price': new_price,
-                        'timestamp': len(st.session_state.transaction_history) + 1
-                    })
-                    
-                    trade_executed = True
-                    st.info(f"🤖 Auto-Sell #{st.session_state.auto_trade_count + 1}: {tokens_to_sell:,.0f} tokens for {virtuals_received:,.2f} Virtuals")
-        
-        if trade_executed:
-            st.session_state.auto_trade_count += 1
-            
-            # Show updated chart immediately after trade
-            st.subheader("📐 Live Trading Updates")
-            
-            # Create a quick update chart
-            fig_update = go.Figure()
-            
-            # Add the hyperbola curve
-            x_values, y_values, k_value = generate_hyperbola_data(initial_supply, initial_virtuals_liquidity)
-            fig_update.add_trace(
-                go.Scatter(
-                    x=x_values / 1_000_000,
-                    y=y_values,
-                    mode='lines',
-                    name='Bonding Curve',
-                    line=dict(color='lightblue', width=2)
-                )
-            )
-            
-            # Add transaction path
-            if len(st.session_state.transaction_history) > 0:
-                history_x = [initial_supply / 1_000_000]
-                history_y = [initial_virtuals_liquidity]
-                
-                temp_token_reserve = initial_supply
-                temp_virtuals_reserve = initial_virtuals_liquidity
-                
-                for tx in st.session_state.transaction_history:
-                    if tx['type'] == 'buy':
-                        temp_virtuals_reserve += tx['virtuals_in']
-                        temp_token_reserve -= tx['tokens_out']
-                    else:
-                        temp_virtuals_reserve -= tx['virtuals_out']
-                        temp_token_reserve += tx['tokens_in']
-                    
-                    history_x.append(temp_token_reserve / 1_000_000)
-                    history_y.append(temp_virtuals_reserve)
-                
-                fig_update.add_trace(
-                    go.Scatter(
-                        x=history_x,
-                        y=history_y,
-                        mode='lines+markers',
-                        name='Trading Path',
-                        line=dict(color='orange', width=4),
-                        marker=dict(size=8, color='orange')
-                    )
-                )
-                
-                # Highlight current position
-                fig_update.add_trace(
-                    go.Scatter(
-                        x=[st.session_state.current_token_reserve / 1_000_000],
-                        y=[st.session_state.current_virtuals_reserve],
-                        mode='markers',
-                        name='Current Position',
-                        marker=dict(color='red', size=20, symbol='circle')
-                    )
-                )
-            
-            # Add graduation point
-            fig_update.add_trace(
-                go.Scatter(
-                    x=[graduation_token_threshold / 1_000_000],
-                    y=[k_value / graduation_token_threshold],
-                    mode='markers',
-                    name='Graduation',
-                    marker=dict(color='green', size=15, symbol='star')
-                )
-            )
-            
-            fig_update.update_layout(
-                title=f"🤖 Auto-Trade #{st.session_state.auto_trade_count} - Live Update",
-                xaxis_title="Token Reserves (Millions)",
-                yaxis_title="Virtuals Reserves",
-                height=400,
-                showlegend=True
-            )
-            
-            st.plotly_chart(fig_update, use_container_width=True, key=f"auto_trade_{st.session_state.auto_trade_count}")
-        
-        # Continue auto-trading by triggering a rerun
-        time.sleep(0.1)  # Small delay to make it visible
-        st.rerun()
+if 'rng' not in st.session_state:
+    st.session_state.rng = np.random.default_rng()  # One generator per session for auto-trading
 
 # Reset button
 col_reset, col_auto, col_status = st.columns([1, 1, 2])
@@ -487,40 +331,56 @@ with col_reset:
     if st.button("🔄 Reset to Initial State"):
         st.session_state.current_token_reserve = initial_supply
         st.session_state.current_virtuals_reserve = initial_virtuals_liquidity
-        st.session_state.transaction_history = []
+        st.session_state.transaction_history = empty_transaction_history()
+        st.session_state.history_x = np.zeros(MAX_PATH_POINTS)
+        st.session_state.history_y = np.zeros(MAX_PATH_POINTS)
+        st.session_state.history_len = 0
         st.session_state.total_tokens_sold = 0
-        st.session_state.auto_trading = False
-        st.session_state.auto_trade_count = 0
         st.rerun()
 
 with col_auto:
-    if not st.session_state.auto_trading:
-        if st.button("🎲 Start Auto Trading"):
-            st.session_state.auto_trading = True
-            st.session_state.auto_trade_count = 0
-            st.rerun()
-    else:
-        # Show stop button and progress during auto-trading
-        col_stop, col_progress = st.columns([1, 1])
-        with col_stop:
-            if st.button("⏹️ Stop Auto Trading"):
-                st.session_state.auto_trading = False
-                st.rerun()
-        with col_progress:
-            st.write(f"🤖 Trade #{st.session_state.auto_trade_count}")
+    auto_trade_clicked = st.button("🎲 Start Auto Trading")
+    if auto_trade_clicked:
+        # Run the whole batch of random trades in one pass, then render once
+        path = simulate_trades(
+            MAX_AUTO_TRADES,
+            st.session_state.current_token_reserve,
+            st.session_state.current_virtuals_reserve,
+            st.session_state.total_tokens_sold,
+            graduation_token_threshold,
+            seed=st.session_state.rng
+        )
+        
+        # Add to history, whole columns at a time
+        record_trades(path.is_buy, path.amount_in, path.amount_out, path.price)
+        record_trade_path(path.token_reserve / 1_000_000, path.virtuals_reserve)
+        
+        # Update state
+        if len(path.is_buy) > 0:
+            # Tokens sold change by exactly what left the token reserve
+            st.session_state.total_tokens_sold += st.session_state.current_token_reserve - float(path.token_reserve[-1])
+            st.session_state.current_token_reserve = float(path.token_reserve[-1])
+            st.session_state.current_virtuals_reserve = float(path.virtuals_reserve[-1])
+        auto_trade_count = len(path.is_buy)
 
 with col_status:
     # Check if graduated
     has_graduated = st.session_state.current_token_reserve <= graduation_token_threshold
     if has_graduated:
         st.success("🎓 **GRADUATED TO UNISWAP!** No more trading on bonding curve.")
-        if st.session_state.auto_trading:
-            st.session_state.auto_trading = False
     else:
         tokens_left_to_grad = st.session_state.current_token_reserve - graduation_token_threshold
         st.info(f"📊 **{tokens_left_to_grad:,.0f}** more tokens need to be sold to graduate")
 
-# Current state display
+if auto_trade_clicked:
+    if has_graduated:
+        st.success(f"🎓 Auto-trading completed! Graduated after {auto_trade_count} trades!")
+    else:
+        # The limit counts attempts, skipped sells included
+        st.warning(f"⚠️ Auto-trading stopped after {MAX_AUTO_TRADES} attempts ({auto_trade_count} trades executed, safety limit)")
+
+# Current state display, fixed for the rest of this run (trades below rerun the app)
+num_trades = len(st.session_state.transaction_history['is_buy'])
 current_price = calculate_price_from_reserves(st.session_state.current_token_reserve, st.session_state.current_virtuals_reserve)
 virtuals_raised_so_far = st.session_state.current_virtuals_reserve - initial_virtuals_liquidity
 
@@ -536,62 +396,21 @@ with col_state4:
 
 # Updated hyperbola with current position
 st.subheader("📐 Live Curve Position")
-fig_live = go.Figure()
-
-# Add the hyperbola curve
-x_values, y_values, k_value = generate_hyperbola_data(initial_supply, initial_virtuals_liquidity)
-fig_live.add_trace(
-    go.Scatter(
-        x=x_values / 1_000_000,
-        y=y_values,
-        mode='lines',
-        name=f'Bonding Curve (k = {k_value:.2e})',
-        line=dict(color='lightblue', width=2, dash='dot')
-    )
-)
-
-# Mark the initial point
-fig_live.add_trace(
-    go.Scatter(
-        x=[initial_supply / 1_000_000],
-        y=[initial_virtuals_liquidity],
-        mode='markers',
-        name='Initial State',
-        marker=dict(color='gray', size=12, symbol='circle')
-    )
+fig_live = build_live_fig(
+    initial_supply, initial_virtuals_liquidity, k_value, graduation_token_threshold,
+    hyperbola_x_min, hyperbola_x_max, num_points
 )
 
-# Mark the graduation point
-fig_live.add_trace(
-    go.Scatter(
-        x=[graduation_token_threshold / 1_000_000],
-        y=[k_value / graduation_token_threshold],
-        mode='markers',
-        name='Graduation Point',
-        marker=dict(color='green', size=15, symbol='star')
-    )
-)
-
-# Add transaction history as a path
-if len(st.session_state.transaction_history) > 0:
-    history_x = [initial_supply / 1_000_000]
-    history_y = [initial_virtuals_liquidity]
+# Add transaction history as a path, the marker order already shows trade direction
+if num_trades > 0:
+    # Trade path recorded as each trade executes
+    history_x, history_y = get_trade_path()
     
-    temp_token_reserve = initial_supply
-    temp_virtuals_reserve = initial_virtuals_liquidity
+    # Start from the initial point unless older trades have been dropped
+    if st.session_state.history_len <= MAX_PATH_POINTS:
+        history_x = np.concatenate(([initial_x_m], history_x))
+        history_y = np.concatenate(([initial_virtuals_liquidity], history_y))
     
-    for tx in st.session_state.transaction_history:
-        if tx['type'] == 'buy':
-            temp_virtuals_reserve += tx['virtuals_in']
-            temp_token_reserve -= tx['tokens_out']
-        else:  # sell
-            temp_virtuals_reserve -= tx['virtuals_out']
-            temp_token_reserve += tx['tokens_in']
-        
-        history_x.append(temp_token_reserve / 1_000_000)
-        history_y.append(temp_virtuals_reserve)
-    
-    # Add the full transaction path
     fig_live.add_trace(
         go.Scatter(
             x=history_x,
@@ -603,38 +422,17 @@ if len(st.session_state.transaction_history) > 0:
         )
     )
     
-    # Highlight the last few trades with different colors
-    if len(history_x) >= 2:
-        # Last trade (most recent)
-        fig_live.add_trace(
-            go.Scatter(
-                x=[history_x[-1]],
-                y=[history_y[-1]],
-                mode='markers',
-                name='Latest Trade',
-                marker=dict(color='red', size=20, symbol='diamond', 
-                          line=dict(width=3, color='white'))
-            )
+    # Last trade (most recent)
+    fig_live.add_trace(
+        go.Scatter(
+            x=[history_x[-1]],
+            y=[history_y[-1]],
+            mode='markers',
+            name='Latest Trade',
+            marker=dict(color='red', size=20, symbol='diamond', 
+                      line=dict(width=3, color='white'))
         )
-        
-        # Second to last trade for direction arrow
-        if len(history_x) >= 3:
-            fig_live.add_annotation(
-                x=history_x[-1],
-                y=history_y[-1],
-                ax=history_x[-2],
-                ay=history_y[-2],
-                xref='x',
-                yref='y',
-                axref='x',
-                ayref='y',
-                showarrow=True,
-                arrowhead=2,
-                arrowsize=2,
-                arrowwidth=3,
-                arrowcolor='red',
-                opacity=0.8
-            )
+    )
 
 # Mark the current position with extra prominence
 fig_live.add_trace(
@@ -649,28 +447,12 @@ fig_live.add_trace(
     )
 )
 
-# Add auto-trading status indicator
-if st.session_state.auto_trading:
-    # Add pulsing effect annotation for auto-trading
-    fig_live.add_annotation(
-        x=st.session_state.current_token_reserve / 1_000_000,
-        y=st.session_state.current_virtuals_reserve,
-        text="🤖 AUTO TRADING",
-        showarrow=False,
-        font=dict(size=12, color="red"),
-        bgcolor="yellow",
-        bordercolor="red",
-        borderwidth=2,
-        xshift=0,
-        yshift=30
-    )
-
 # Add graduation progress indicator
 graduation_progress = ((initial_supply - st.session_state.current_token_reserve) / 
                       (initial_supply - graduation_token_threshold)) * 100
 graduation_progress = min(100, max(0, graduation_progress))
 
-fig_live.add_annotation(
+live_annotations = [dict(
     x=0.02,
     y=0.98,
     xref='paper',
@@ -681,43 +463,37 @@ fig_live.add_annotation(
     bgcolor="lightblue",
     bordercolor="blue",
     borderwidth=1
-)
+)]
 
 # Add live metrics overlay
-current_price = calculate_price_from_reserves(st.session_state.current_token_reserve, st.session_state.current_virtuals_reserve)
 price_change = ((current_price / initial_price - 1) * 100) if initial_price > 0 else 0
 
-fig_live.add_annotation(
+live_annotations.append(dict(
     x=0.98,
     y=0.98,
     xref='paper',
     yref='paper',
-    text=f"Current Price: {current_price:.6f}<br>Change: {price_change:+.1f}%<br>Trades: {len(st.session_state.transaction_history)}",
+    text=f"Current Price: {current_price:.6f}<br>Change: {price_change:+.1f}%<br>Trades: {num_trades}",
     showarrow=False,
     font=dict(size=12, color="darkblue"),
     bgcolor="lightgray",
     bordercolor="gray",
     borderwidth=1,
     align="right"
-)
-
-fig_live.update_layout(
-    title="Real-time Position on Bonding Curve",
-    xaxis_title="Token Reserves (Millions)",
-    yaxis_title="Virtuals Reserves",
-    height=500,
-    showlegend=True
-)
+))
 
-# Add grid and improve styling
-fig_live.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', zeroline=True)
-fig_live.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray', zeroline=True)
+fig_live.update_layout(annotations=live_annotations)
 
-st.plotly_chart(fig_live, use_container_width=True)
+st.plotly_chart(fig_live, theme=None, use_container_width=True)
 
 # Trading interface
 if not has_graduated:
     st.subheader("💰 Manual Trading")
+
+    # Input bounds, computed once per rerun
+    max_virtuals_spend = float(st.session_state.current_virtuals_reserve * 0.9)
+    max_sellable = float(st.session_state.total_tokens_sold * 0.99)  # Can't sell more than 99% of what you bought
+
     col3, col4 = st.columns(2)
 
     with col3:
@@ -725,7 +501,7 @@ if not has_graduated:
         virtuals_to_spend = st.number_input(
             "Virtuals to spend", 
             min_value=1.0, 
-            max_value=float(st.session_state.current_virtuals_reserve * 0.9), 
+            max_value=max_virtuals_spend, 
             value=1000.0, 
             step=1.0,
             key="buy_input"
@@ -741,7 +517,7 @@ if not has_graduated:
             # Calculate new state
             new_virtuals_reserve = st.session_state.current_virtuals_reserve + virtuals_to_spend
             new_token_reserve = st.session_state.current_token_reserve - tokens_received
-            new_price = calculate_price_from_reserves(new_token_reserve, new_virtuals_reserve)
+            new_price = new_virtuals_reserve / new_token_reserve
             
             price_impact = ((new_price / current_price - 1) * 100) if current_price > 0 else 0
             
@@ -753,7 +529,16 @@ if not has_graduated:
             will_graduate = new_token_reserve <= graduation_token_threshold
             if will_graduate:
                 st.warning("⚠️ This trade will trigger graduation!")
-            
+
+            # Smallest buy that triggers graduation, solved directly from x * y = k
+            virtuals_to_graduate = calculate_buy_to_reach_token_reserve(
+                graduation_token_threshold,
+                st.session_state.current_token_reserve,
+                st.session_state.current_virtuals_reserve
+            )
+            if virtuals_to_graduate <= max_virtuals_spend:
+                st.caption(f"Graduation at ≥ {virtuals_to_graduate:,.0f} Virtuals")
+
             if st.button("Execute Buy Trade", key="execute_buy"):
                 # Execute the trade
                 st.session_state.current_virtuals_reserve = new_virtuals_reserve
@@ -761,26 +546,19 @@ if not has_graduated:
                 st.session_state.total_tokens_sold += tokens_received
                 
                 # Add to transaction history
-                st.session_state.transaction_history.append({
-                    'type': 'buy',
-                    'virtuals_in': virtuals_to_spend,
-                    'tokens_out': tokens_received,
-                    'price': new_price,
-                    'timestamp': len(st.session_state.transaction_history) + 1
-                })
+                record_trades(True, virtuals_to_spend, tokens_received, new_price)
+                record_trade_path(new_token_reserve / 1_000_000, new_virtuals_reserve)
                 
                 st.success(f"✅ Bought {tokens_received:,.0f} tokens for {virtuals_to_spend:,.0f} Virtuals!")
                 st.rerun()
 
     with col4:
         st.write("**🔴 Sell Tokens**")
-        max_sellable = st.session_state.total_tokens_sold * 0.99  # Can't sell more than 90% of what you bought
-        
         if max_sellable > 0:
             tokens_to_sell = st.number_input(
                 "Tokens to sell", 
                 min_value=1.0, 
-                max_value=float(max_sellable), 
+                max_value=max_sellable, 
                 value=min(10000.0, max_sellable), 
                 step=1.0,
                 key="sell_input"
@@ -796,7 +574,7 @@ if not has_graduated:
                 # Calculate new state
                 new_virtuals_reserve = st.session_state.current_virtuals_reserve - virtuals_received
                 new_token_reserve = st.session_state.current_token_reserve + tokens_to_sell
-                new_price = calculate_price_from_reserves(new_token_reserve, new_virtuals_reserve)
+                new_price = new_virtuals_reserve / new_token_reserve
                 
                 price_impact = ((new_price / current_price - 1) * 100) if current_price > 0 else 0
                 
@@ -811,13 +589,8 @@ if not has_graduated:
                     st.session_state.total_tokens_sold = max(0, st.session_state.total_tokens_sold - tokens_to_sell)
                     
                     # Add to transaction history
-                    st.session_state.transaction_history.append({
-                        'type': 'sell',
-                        'tokens_in': tokens_to_sell,
-                        'virtuals_out': virtuals_received,
-                        'price': new_price,
-                        'timestamp': len(st.session_state.transaction_history) + 1
-                    })
+                    record_trades(False, tokens_to_sell, virtuals_received, new_price)
+                    record_trade_path(new_token_reserve / 1_000_000, new_virtuals_reserve)
                     
                     st.success(f"✅ Sold {tokens_to_sell:,.0f} tokens for {virtuals_received:,.2f} Virtuals!")
                     st.rerun()
@@ -825,47 +598,88 @@ if not has_graduated:
             st.info("💡 Buy some tokens first to enable selling!")
 
 # Transaction History
-if len(st.session_state.transaction_history) > 0:
+if num_trades > 0:
     st.subheader("📜 Transaction History")
     
-    # Create transaction dataframe
-    tx_data = []
-    for i, tx in enumerate(st.session_state.transaction_history):
-        if tx['type'] == 'buy':
-            tx_data.append({
-                'Trade #': i + 1,
-                'Type': '🟢 BUY',
-                'Virtuals In': f"{tx['virtuals_in']:,.0f}",
-                'Tokens Out': f"{tx['tokens_out']:,.0f}",
-                'Price': f"{tx['price']:.8f}",
-                'Action': f"Spent {tx['virtuals_in']:,.0f} Virtuals → Got {tx['tokens_out']:,.0f} tokens"
-            })
-        else:
-            tx_data.append({
-                'Trade #': i + 1,
-                'Type': '🔴 SELL',
-                'Tokens In': f"{tx['tokens_in']:,.0f}",
-                'Virtuals Out': f"{tx['virtuals_out']:,.2f}",
-                'Price': f"{tx['price']:.8f}",
-                'Action': f"Sold {tx['tokens_in']:,.0f} tokens → Got {tx['virtuals_out']:,.2f} Virtuals"
-            })
+    # Column-wise history straight into a frame, shared by the table and the summary
+    trades = pd.DataFrame(st.session_state.transaction_history)
+    is_buy = trades['is_buy'].to_numpy()
+    
+    # Pre-format the amounts once, sells pay out Virtuals to two decimals
+    amount_in = trades['amount_in'].map('{:,.0f}'.format).to_numpy()
+    amount_out = np.where(
+        is_buy,
+        trades['amount_out'].map('{:,.0f}'.format),
+        trades['amount_out'].map('{:,.2f}'.format)
+    )
     
-    df = pd.DataFrame(tx_data)
+    # Fixed columns, cells that don't apply to a trade's type stay blank
+    df = pd.DataFrame({
+        'Trade #': np.arange(1, num_trades + 1),
+        'Type': np.where(is_buy, '🟢 BUY', '🔴 SELL'),
+        'Virtuals In': np.where(is_buy, amount_in, ''),
+        'Tokens Out': np.where(is_buy, amount_out, ''),
+        'Tokens In': np.where(is_buy, '', amount_in),
+        'Virtuals Out': np.where(is_buy, '', amount_out),
+        'Price': trades['price'].map('{:.8f}'.format),
+        'Action': np.where(
+            is_buy,
+            "Spent " + amount_in + " Virtuals → Got " + amount_out + " tokens",
+            "Sold " + amount_in + " tokens → Got " + amount_out + " Virtuals"
+        )
+    })
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Summary stats
-    buy_trades = [tx for tx in st.session_state.transaction_history if tx['type'] == 'buy']
-    sell_trades = [tx for tx in st.session_state.transaction_history if tx['type'] == 'sell']
+    total_virtuals_spent, total_tokens_bought = trades.loc[is_buy, ['amount_in', 'amount_out']].sum()
     
     summary_col1, summary_col2, summary_col3 = st.columns(3)
     with summary_col1:
-        st.metric("Total Trades", len(st.session_state.transaction_history))
+        st.metric("Total Trades", num_trades)
     with summary_col2:
-        total_virtuals_spent = sum(tx['virtuals_in'] for tx in buy_trades)
         st.metric("Total Virtuals Spent", f"{total_virtuals_spent:,.0f}")
     with summary_col3:
-        total_tokens_bought = sum(tx['tokens_out'] for tx in buy_trades)
         st.metric("Total Tokens Bought", f"{total_tokens_bought:,.0f}")
 
 else:
     st.info("💡 Make your first trade to see the transaction history!")
+
+# Parameter sweep over the sidebar's asset rate and supply ranges
+with st.expander("🗺️ Parameter Sweep"):
+    st.caption(
+        f"Every asset rate and supply the sidebar allows, for the current "
+        f"graduation threshold of {grad_threshold_virtuals:,} Virtuals."
+    )
+    
+    sweep_asset_rates = np.arange(1000, 20001, 1000)
+    sweep_supplies_billions = np.arange(1, 101) / 10
+    sweep_prices, sweep_thresholds = generate_parameter_sweep(
+        sweep_asset_rates, sweep_supplies_billions * 1_000_000_000, grad_threshold_virtuals
+    )
+    
+    sweep_col1, sweep_col2 = st.columns(2)
+    with sweep_col1:
+        # Prices span several orders of magnitude, so color by log10
+        fig_sweep_price = px.imshow(
+            np.log10(sweep_prices),
+            x=sweep_supplies_billions,
+            y=sweep_asset_rates,
+            labels={'x': "Initial Token Supply (Billions)", 'y': "Asset Rate", 'color': "log10(Price)"},
+            title="Initial Price (log10 Virtuals per token)",
+            origin='lower',
+            aspect='auto'
+        )
+        st.plotly_chart(fig_sweep_price, theme=None, use_container_width=True)
+    
+    with sweep_col2:
+        # Share of the supply still in the pool when the curve graduates
+        fig_sweep_grad = px.imshow(
+            sweep_thresholds / (sweep_supplies_billions * 1_000_000_000) * 100,
+            x=sweep_supplies_billions,
+            y=sweep_asset_rates,
+            labels={'x': "Initial Token Supply (Billions)", 'y': "Asset Rate", 'color': "% of Supply"},
+            title="Graduation Threshold (% of supply left in reserve)",
+            origin='lower',
+            aspect='auto'
+        )
+        st.plotly_chart(fig_sweep_grad, theme=None, use_container_width=True)
@@ -0,0 +1,201 @@
+"""Constant product bonding curve formulas used by the Bonding.sol explorer"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Constant from Bonding.sol
+K_CONSTANT = 3_000_000_000_000
+
+def calculate_initial_liquidity(token_supply, asset_rate, k_constant=K_CONSTANT):
+    """
+    Calculate initial Virtuals liquidity based on Bonding.sol formula:
+    k = ((K * 10000) / assetRate)
+    liquidity = (((k * 10000) / supply)) / 10000
+    The extra * 10000 / 10000 is fixed-point scaling in Solidity, so in
+    floats this reduces to K * 10000 / (assetRate * supply).
+    Works element-wise on NumPy arrays as well as scalars.
+    """
+    return k_constant * 10000.0 / (asset_rate * token_supply)
+
+def calculate_price_from_reserves(token_reserve, virtuals_reserve):
+    """
+    Calculate price as Virtuals per token from reserves
+    Reserves may be scalars or NumPy arrays; an empty token reserve prices at 0.
+    """
+    token_reserve = np.asarray(token_reserve, dtype=float)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price = virtuals_reserve / token_reserve
+    return np.where(token_reserve == 0, 0.0, price)[()]
+
+def calculate_buy_amount_out(amount_virtuals_in, token_reserve, virtuals_reserve):
+    """
+    Calculate tokens received for Virtuals input using constant product formula
+    amount_out = (amount_in * reserve_out) / (reserve_in + amount_in)
+    amount_virtuals_in may be a scalar or a NumPy array of trade sizes.
+    """
+    amount_virtuals_in = np.asarray(amount_virtuals_in, dtype=float)
+    
+    # Add 0.3% fee (like Uniswap)
+    amount_virtuals_in_after_fee = np.maximum(amount_virtuals_in, 0) * 0.997
+    
+    amount_token_out = (amount_virtuals_in_after_fee * token_reserve) / (virtuals_reserve + amount_virtuals_in_after_fee)
+    return np.where(amount_virtuals_in > 0, amount_token_out, 0.0)[()]
+
+def calculate_sell_amount_out(amount_token_in, token_reserve, virtuals_reserve):
+    """
+    Calculate Virtuals received for token input using constant product formula
+    amount_token_in may be a scalar or a NumPy array of trade sizes.
+    """
+    amount_token_in = np.asarray(amount_token_in, dtype=float)
+    
+    # Add 0.3% fee
+    amount_token_in_after_fee = np.maximum(amount_token_in, 0) * 0.997
+    
+    amount_virtuals_out = (amount_token_in_after_fee * virtuals_reserve) / (token_reserve + amount_token_in_after_fee)
+    return np.where(amount_token_in > 0, amount_virtuals_out, 0.0)[()]
+
+def calculate_buy_to_reach_token_reserve(target_token_reserve, token_reserve, virtuals_reserve):
+    """
+    Calculate the Virtuals input that brings the token reserve down to target_token_reserve.
+    Inverts calculate_buy_amount_out: after the buy, token_reserve * virtuals_reserve
+    = target_token_reserve * (virtuals_reserve + amount_in_after_fee).
+    """
+    amount_in_after_fee = token_reserve * virtuals_reserve / target_token_reserve - virtuals_reserve
+    return amount_in_after_fee / 0.997
+
+def calculate_graduation_token_threshold(initial_token_supply, graduation_virtuals_needed, initial_virtuals_liquidity):
+    """
+    Calculate how many tokens need to be sold to raise the graduation threshold in Virtuals.
+    This is when token_reserve drops to a level where we've raised enough Virtuals.
+    Works element-wise on NumPy arrays as well as scalars.
+    """
+    # We need to find the token reserve level where:
+    # virtuals_reserve = initial_virtuals_liquidity + graduation_virtuals_needed
+    target_virtuals_reserve = initial_virtuals_liquidity + graduation_virtuals_needed
+    
+    # Using constant product: token_reserve * virtuals_reserve = k
+    k = initial_token_supply * initial_virtuals_liquidity
+    target_token_reserve = k / target_virtuals_reserve
+    
+    return target_token_reserve
+
+def generate_parameter_sweep(asset_rates, supplies, graduation_virtuals_needed):
+    """
+    Evaluate the launch parameters over a grid of asset rates and supplies.
+    Returns (initial_prices, graduation_thresholds), each shaped
+    (len(asset_rates), len(supplies)), e.g. for a heatmap.
+    """
+    # Rates down the rows, supplies across the columns
+    asset_rates = np.asarray(asset_rates, dtype=float)[:, np.newaxis]
+    supplies = np.asarray(supplies, dtype=float)[np.newaxis, :]
+    
+    initial_liquidity = calculate_initial_liquidity(supplies, asset_rates)
+    initial_prices = initial_liquidity / supplies
+    graduation_thresholds = calculate_graduation_token_threshold(
+        supplies, graduation_virtuals_needed, initial_liquidity
+    )
+    
+    return initial_prices, graduation_thresholds
+
+@dataclass
+class TradePath:
+    """
+    Trades executed by simulate_trades, one entry per trade.
+    Reserves are the pool state after each trade. Tokens sold move one-for-one
+    against the token reserve, so the change in tokens sold is not stored.
+    """
+    is_buy: np.ndarray
+    amount_in: np.ndarray
+    amount_out: np.ndarray
+    token_reserve: np.ndarray
+    virtuals_reserve: np.ndarray
+
+    @property
+    def price(self):
+        """Price as Virtuals per token after each trade"""
+        return calculate_price_from_reserves(self.token_reserve, self.virtuals_reserve)
+
+def simulate_trades(num_trades, token_reserve, virtuals_reserve, total_tokens_sold,
+                    graduation_token_threshold, seed=None):
+    """
+    Run up to num_trades random trades against the pool in one pass, stopping
+    once the token reserve reaches the graduation threshold.
+    60% of trades are buys of ~N(1000, 300) Virtuals; sells are sized from
+    the tokens bought so far and are skipped until more than 1000 are sold.
+    All random draws are made up front. seed may be an int for a reproducible
+    run or an existing np.random.Generator to continue its stream.
+    """
+    # Already graduated, nothing to simulate
+    if token_reserve <= graduation_token_threshold:
+        num_trades = 0
+
+    rng = np.random.default_rng(seed)
+    # Drawn as arrays, walked as Python floats so the loop avoids NumPy scalar math
+    buy_draws = (rng.random(num_trades) < 0.60).tolist()
+    size_draws = rng.standard_normal(num_trades).tolist()
+    token_reserve = float(token_reserve)
+    virtuals_reserve = float(virtuals_reserve)
+    total_tokens_sold = float(total_tokens_sold)
+
+    is_buy = np.empty(num_trades, dtype=bool)
+    amount_in = np.empty(num_trades)
+    amount_out = np.empty(num_trades)
+    token_reserves = np.empty(num_trades)
+    virtuals_reserves = np.empty(num_trades)
+    executed = 0
+
+    for buy_draw, size_draw in zip(buy_draws, size_draws):
+        if buy_draw:
+            # Normally distributed buy, clipped to [500, min(20% of reserve, 20000)]
+            max_virtuals = min(virtuals_reserve * 0.2, 20000)
+            virtuals_to_spend = max(500, min(max_virtuals, 1000 + 300 * size_draw))
+
+            # calculate_buy_amount_out inlined, the size is always positive here
+            virtuals_after_fee = virtuals_to_spend * 0.997
+            tokens_received = virtuals_after_fee * token_reserve / (virtuals_reserve + virtuals_after_fee)
+            if tokens_received <= 0:
+                continue
+
+            virtuals_reserve += virtuals_to_spend
+            token_reserve -= tokens_received
+            total_tokens_sold += tokens_received
+            amount_in[executed] = virtuals_to_spend
+            amount_out[executed] = tokens_received
+        else:
+            # Only sell if we have tokens to sell
+            if total_tokens_sold <= 1000:
+                continue
+
+            max_sellable = total_tokens_sold * 0.3
+            mean_tokens = min(1000000, max_sellable * 0.5)
+            tokens_to_sell = max(500, min(max_sellable, mean_tokens + mean_tokens * 0.4 * size_draw))
+
+            # calculate_sell_amount_out inlined, the size is always positive here
+            tokens_after_fee = tokens_to_sell * 0.997
+            virtuals_received = tokens_after_fee * virtuals_reserve / (token_reserve + tokens_after_fee)
+            if virtuals_received <= 0:
+                continue
+
+            virtuals_reserve -= virtuals_received
+            token_reserve += tokens_to_sell
+            total_tokens_sold = max(0, total_tokens_sold - tokens_to_sell)
+            amount_in[executed] = tokens_to_sell
+            amount_out[executed] = virtuals_received
+
+        is_buy[executed] = buy_draw
+        token_reserves[executed] = token_reserve
+        virtuals_reserves[executed] = virtuals_reserve
+        executed += 1
+
+        # Sells only add tokens back, so only a buy can cross the threshold
+        if buy_draw and token_reserve <= graduation_token_threshold:
+            break
+
+    return TradePath(
+        is_buy=is_buy[:executed],
+        amount_in=amount_in[:executed],
+        amount_out=amount_out[:executed],
+        token_reserve=token_reserves[:executed],
+        virtuals_reserve=virtuals_reserves[:executed]
+    )